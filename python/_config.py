@@ -0,0 +1,27 @@
+"""Shared config.json loader for the scripts in this directory."""
+
+import functools
+import pathlib
+
+from _fastjson import loads
+
+
+@functools.lru_cache(maxsize=1)
+def load_config(path="config.json"):
+    """
+    Load and parse a JSON config file, caching the result so repeated imports
+    (or multiple helpers in one process) read the file only once. Returns {}
+    if the file is missing or malformed, after printing what went wrong.
+    """
+    try:
+        # read_bytes + loads skips the line-buffered text decode of json.load(open(...))
+        config_data = loads(pathlib.Path(path).read_bytes())
+        print("Configuration data loaded successfully")
+        return config_data
+    except FileNotFoundError:
+        print(f"Error: The file '{path}' was not found.")
+    except ValueError:
+        print(f"Error: Could not decode JSON from '{path}'. Check file format.")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+    return {}
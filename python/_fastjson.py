@@ -0,0 +1,25 @@
+"""JSON loads/dumps helpers that use orjson when it is installed.
+
+orjson parses and serializes several times faster than the stdlib json
+module and accepts bytes directly, skipping a decode step on response
+bodies. Falls back to stdlib json so the scripts still run without it.
+"""
+
+try:
+    import orjson
+
+    def loads(data):
+        return orjson.loads(data)
+
+    def dumps(obj, indent=False):
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode("utf-8")
+
+except ImportError:
+    import json
+
+    def loads(data):
+        return json.loads(data)
+
+    def dumps(obj, indent=False):
+        return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
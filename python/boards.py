@@ -27,24 +27,25 @@ import os
 import sys
 import time
 import uuid
-import json
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Iterable, Tuple
 
 import requests  # has to be installed via pip
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from _fastjson import dumps as _json_dumps, loads as _json_loads
 
-file_path = 'config.json'
-config_data = {}
 try:
-	with open(file_path, 'r') as f:
-		config_data = json.load(f)
-	print("Configuration data loaded successfully:")
-except FileNotFoundError:
-	print(f"Error: The file '{file_path}' was not found.")
-except json.JSONDecodeError:
-	print(f"Error: Could not decode JSON from '{file_path}'. Check file format.")
-except Exception as e:
-	print(f"An unexpected error occurred: {e}")
+    import ijson  # optional: incremental JSON parsing for large /blocks responses
+except ImportError:
+    ijson = None
+
+from _config import load_config
+
+config_data = load_config()
 
 # --- Configuration via env ---
 BASE_URL = config_data['base_url']
@@ -61,6 +62,24 @@ HEADERS = {
 
 TIMEOUT = 20  # seconds
 
+# --- Shared HTTP session ---
+# One pooled Session for the whole module: keep-alive avoids a fresh TCP+TLS
+# handshake per API call, and the adapter retries transient gateway errors.
+SESSION = requests.Session()
+SESSION.headers.update({k: v for k, v in HEADERS.items() if v})
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+
+def close():
+    """Close the shared session (frees pooled sockets; useful in test teardown)."""
+    SESSION.close()
+
 
 # --------------------- Utilities ---------------------
 
@@ -75,14 +94,15 @@ def _url(path: str) -> str:
     return f"{BASE_URL}{path}"
 
 
-def _request(method: str, path: str, json_body: Optional[Any] = None) -> requests.Response:
-    # Use single-shot requests (not Session) to avoid cookie persistence.
-    return requests.request(
+def _request(
+    method: str, path: str, json_body: Optional[Any] = None, stream: bool = False
+) -> requests.Response:
+    return SESSION.request(
         method=method.upper(),
         url=_url(path),
-        headers=HEADERS,
         json=json_body,
         timeout=TIMEOUT,
+        stream=stream,
     )
 
 
@@ -92,7 +112,7 @@ def _raise_for_status(resp: requests.Response, label: str):
     msg = f"{label} failed: HTTP {resp.status_code}"
     try:
         j = resp.json()
-        msg += f" | server says: {json.dumps(j, ensure_ascii=False)}"
+        msg += f" | server says: {_json_dumps(j)}"
     except Exception:
         body = resp.text.strip()
         if body:
@@ -103,7 +123,7 @@ def _raise_for_status(resp: requests.Response, label: str):
 def _print_json(obj: Any, title: Optional[str] = None, max_chars: int = 0):
     if title:
         print(f"\n== {title} ==")
-    s = json.dumps(obj, indent=2, ensure_ascii=False)
+    s = _json_dumps(obj, indent=True)
     if max_chars and len(s) > max_chars:
         print(s[:max_chars] + "\n... [truncated]")
     else:
@@ -130,10 +150,71 @@ def list_boards(team_id: str) -> List[Dict[str, Any]]:
     return r.json()
 
 
+# Short-lived cache of /blocks responses keyed by board_id. The helpers below
+# (find by title, properties map, card listing) often hit the same board several
+# times in a row; within the TTL they reuse the payload instead of re-fetching.
+_BLOCKS_CACHE: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+_BLOCKS_TTL = 5.0  # seconds
+_BLOCKS_LOCK = threading.Lock()  # callers may fetch from worker threads
+
+
+def invalidate_blocks_cache(board_id: Optional[str] = None):
+    """Drop the cached /blocks payload for one board (or all boards if None)."""
+    with _BLOCKS_LOCK:
+        if board_id is None:
+            _BLOCKS_CACHE.clear()
+        else:
+            _BLOCKS_CACHE.pop(board_id, None)
+
+
 def list_blocks(board_id: str) -> List[Dict[str, Any]]:
-    r = _request("GET", f"/plugins/focalboard/api/v2/boards/{board_id}/blocks")
-    _raise_for_status(r, f"GET blocks for board {board_id}")
-    return r.json()
+    with _BLOCKS_LOCK:
+        cached = _BLOCKS_CACHE.get(board_id)
+    if cached and time.time() - cached[0] < _BLOCKS_TTL:
+        return cached[1]
+    # Stream and parse straight off the socket: Response.json() would hold the
+    # body as a str alongside the parsed object, one extra full-size copy.
+    with _request("GET", f"/plugins/focalboard/api/v2/boards/{board_id}/blocks", stream=True) as r:
+        _raise_for_status(r, f"GET blocks for board {board_id}")
+        blocks = _json_loads(r.raw.read(decode_content=True))
+    with _BLOCKS_LOCK:
+        _BLOCKS_CACHE[board_id] = (time.time(), blocks)
+    return blocks
+
+
+def iter_blocks(board_id: str) -> Iterable[Dict[str, Any]]:
+    """
+    Yield the board's blocks one at a time.
+
+    Serves straight from the TTL cache when it is fresh. On a cache miss,
+    with ijson installed, the response is streamed and blocks are yielded as
+    they are parsed (the first match arrives before the download finishes,
+    and a limit-bounded caller that stops early never buffers the rest);
+    without ijson this falls back to the buffered list_blocks(). A fully
+    consumed stream populates the cache, so follow-up lookups within the TTL
+    cost no extra round-trip.
+    """
+    with _BLOCKS_LOCK:
+        cached = _BLOCKS_CACHE.get(board_id)
+    if cached and time.time() - cached[0] < _BLOCKS_TTL:
+        yield from cached[1]
+        return
+    if ijson is None:
+        yield from list_blocks(board_id)
+        return
+    blocks: List[Dict[str, Any]] = []
+    with _request("GET", f"/plugins/focalboard/api/v2/boards/{board_id}/blocks", stream=True) as r:
+        _raise_for_status(r, f"GET blocks for board {board_id}")
+        # urllib3 leaves Content-Encoding to the caller on raw reads; without
+        # this, a gzip-compressing server would feed ijson compressed bytes.
+        r.raw.decode_content = True
+        # use_float keeps non-integer numbers as floats (ijson's default
+        # Decimal would break JSON re-serialization of cached blocks)
+        for b in ijson.items(r.raw, "item", use_float=True):
+            blocks.append(b)
+            yield b
+    with _BLOCKS_LOCK:
+        _BLOCKS_CACHE[board_id] = (time.time(), blocks)
 
 
 def create_card(board_id: str, title: str, properties: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -175,37 +256,95 @@ def create_card(board_id: str, title: str, properties: Optional[Dict[str, Any]]
 
     r = _request("POST", f"/plugins/focalboard/api/v2/boards/{board_id}/blocks", json_body=body)
     _raise_for_status(r, f"POST create card on board {board_id}")
+    invalidate_blocks_cache(board_id)  # make the new card visible to cached readers
     data = r.json()
     return data[0] if isinstance(data, list) and data else data
 
 
 # --------------------- Helpers: cards & properties ---------------------
 
+def _extract_props(block: Dict[str, Any]) -> Dict:
+    """
+    Pull the properties dict out of a card block, tolerating missing or
+    malformed fields without allocating throwaway fallback dicts.
+    """
+    f = block.get("fields")
+    if not isinstance(f, dict):
+        return {}
+    p = f.get("properties")
+    return p if isinstance(p, dict) else {}
+
+
+def iter_card_blocks(board_id: str) -> Iterable[Dict[str, Any]]:
+    """
+    Yield all non-deleted card blocks on a board as they are parsed.
+    """
+    for b in iter_blocks(board_id):
+        if (
+            isinstance(b, dict)
+            and b.get("type") == "card"
+            and int(b.get("deleteAt", 0) or 0) == 0
+        ):
+            yield b
+
+
 def list_card_blocks(board_id: str) -> List[Dict[str, Any]]:
     """
     Return all non-deleted card blocks on a board.
     """
-    blocks = list_blocks(board_id)
-    return [
-        b for b in blocks
-        if isinstance(b, dict)
-        and b.get("type") == "card"
-        and int(b.get("deleteAt", 0) or 0) == 0
-    ]
+    return list(iter_card_blocks(board_id))
+
+
+def iter_cards_properties(board_id: str) -> Iterable[Tuple[str, Dict]]:
+    """
+    Yield (card_id, properties_dict) pairs lazily, so callers that only need
+    the first few cards never pay for the whole board.
+    """
+    for c in iter_card_blocks(board_id):
+        yield c.get("id", ""), _extract_props(c)
 
 
 def cards_properties_map(board_id: str) -> Dict[str, Dict]:
     """
     Build {card_id: properties_dict} for all cards on the board.
     """
-    cards = list_card_blocks(board_id)
-    out: Dict[str, Dict] = {}
-    for c in cards:
-        props = (c.get("fields") or {}).get("properties") or {}
-        if not isinstance(props, dict):
-            props = {}
-        out[c.get("id", "")] = props
-    return out
+    return dict(iter_cards_properties(board_id))
+
+
+def _norm_title(s: str, case_insensitive: bool = True) -> str:
+    s = (s or "").strip()
+    return s.casefold() if case_insensitive else s
+
+
+def _match_titles(titles: List[str], needle_norm: str, exact: bool, ci: bool) -> List[int]:
+    """
+    Return the indices of titles matching an already-normalized needle.
+    Normalization is hoisted into a single comprehension so the scan runs as
+    two C-level passes instead of one Python function call per title.
+    """
+    if ci:
+        titles_n = [(t or "").strip().casefold() for t in titles]
+    else:
+        titles_n = [(t or "").strip() for t in titles]
+    if exact:
+        return [i for i, t in enumerate(titles_n) if t == needle_norm]
+    return [i for i, t in enumerate(titles_n) if needle_norm in t]
+
+
+def build_title_index(
+    board_id: str,
+    *,
+    case_insensitive: bool = True,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Build {normalized_title: [card blocks]} in one pass over the board's cards.
+    Lets callers do many title lookups without re-scanning every card.
+    """
+    index: Dict[str, List[Dict[str, Any]]] = {}
+    for c in list_card_blocks(board_id):
+        nt = _norm_title(c.get("title", ""), case_insensitive)
+        index.setdefault(nt, []).append(c)
+    return index
 
 
 def find_cards_by_title(
@@ -214,29 +353,81 @@ def find_cards_by_title(
     *,
     exact: bool = True,
     case_insensitive: bool = True,
+    index: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    limit: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """
     Find cards by their visible title. Returns a list of full card blocks.
     - exact=True: title must match exactly (after normalization)
     - exact=False: substring/contains match
+    - index: optional prebuilt title index (see build_title_index); exact
+      lookups become a single dict access and substring lookups scan the
+      index keys instead of re-fetching and re-normalizing every card.
+    - limit: stop after this many matches (short-circuits the scan, so with
+      streaming blocks the first hit never waits for the full download).
     """
-    key = name.strip()
-
-    def norm(s: str) -> str:
-        s = (s or "").strip()
-        return s.lower() if case_insensitive else s
+    nk = _norm_title(name, case_insensitive)
 
-    nk = norm(key)
-    cards = list_card_blocks(board_id)
     results: List[Dict[str, Any]] = []
-    for c in cards:
-        title = c.get("title", "")
-        nt = norm(title)
-        if exact and nt == nk:
-            results.append(c)
-        elif not exact and (nk in nt):
-            results.append(c)
-    return results
+    if index is not None:
+        if exact:
+            results = list(index.get(nk, []))
+        else:
+            for nt, cards in index.items():
+                if nk in nt:
+                    results.extend(cards)
+                    if limit is not None and len(results) >= limit:
+                        break
+        return results[:limit] if limit is not None else results
+
+    if limit is not None:
+        # Streaming path: stop pulling blocks as soon as we have enough hits.
+        for c in iter_card_blocks(board_id):
+            nt = _norm_title(c.get("title", ""), case_insensitive)
+            if (exact and nt == nk) or (not exact and nk in nt):
+                results.append(c)
+                if len(results) >= limit:
+                    break
+        return results
+
+    # Unbounded path: batch the scan through _match_titles, which is several
+    # times faster than the per-card loop on large cached boards.
+    cards = list_card_blocks(board_id)
+    titles = [c.get("title", "") for c in cards]
+    return [cards[i] for i in _match_titles(titles, nk, exact, case_insensitive)]
+
+
+class CardQuery:
+    """
+    Run id/title lookups over one in-memory list of card blocks.
+
+    Build it from a single fetch and query as often as needed with zero extra
+    HTTP calls: ids and exact titles resolve through prebuilt indexes, and
+    substring matches scan titles normalized once at construction.
+    """
+
+    def __init__(self, cards: List[Dict[str, Any]], *, case_insensitive: bool = True):
+        self.cards = list(cards)
+        self.case_insensitive = case_insensitive
+        self._by_id = {c.get("id", ""): c for c in self.cards}
+        self._by_title: Dict[str, List[Dict[str, Any]]] = {}
+        for c in self.cards:
+            nt = _norm_title(c.get("title", ""), case_insensitive)
+            self._by_title.setdefault(nt, []).append(c)
+
+    def by_id(self, card_id: str) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(card_id)
+
+    def by_title_exact(self, name: str) -> List[Dict[str, Any]]:
+        return list(self._by_title.get(_norm_title(name, self.case_insensitive), []))
+
+    def by_title_contains(self, name: str) -> List[Dict[str, Any]]:
+        nk = _norm_title(name, self.case_insensitive)
+        results: List[Dict[str, Any]] = []
+        for nt, cards in self._by_title.items():
+            if nk in nt:
+                results.extend(cards)
+        return results
 
 
 def get_card_properties(board_id: str, card_id: str) -> Dict:
@@ -246,8 +437,7 @@ def get_card_properties(board_id: str, card_id: str) -> Dict:
     r = _request("GET", f"/plugins/focalboard/api/v2/boards/{board_id}/blocks/{card_id}")
     _raise_for_status(r, f"GET block {card_id} on board {board_id}")
     block = r.json()
-    props = (block.get("fields") or {}).get("properties") or {}
-    return props if isinstance(props, dict) else {}
+    return _extract_props(block)
 
 
 def get_card_properties_by_title(
@@ -257,6 +447,7 @@ def get_card_properties_by_title(
     exact: bool = True,
     case_insensitive: bool = True,
     on_ambiguous: str = "error",   # "error" | "first" | "all"
+    index: Optional[Dict[str, List[Dict[str, Any]]]] = None,
 ):
     """
     Find by title, then return properties.
@@ -264,28 +455,19 @@ def get_card_properties_by_title(
         - on_ambiguous="error": raises RuntimeError
         - on_ambiguous="first": returns the first match's properties
         - on_ambiguous="all": returns a list of (card_id, properties) for all matches
+    - index: optional prebuilt title index, forwarded to find_cards_by_title.
     """
-    matches = find_cards_by_title(board_id, name, exact=exact, case_insensitive=case_insensitive)
+    matches = find_cards_by_title(
+        board_id, name, exact=exact, case_insensitive=case_insensitive, index=index
+    )
     if not matches:
         raise RuntimeError(f"No card found with title{'' if exact else ' containing'} '{name}'")
 
-    if len(matches) == 1:
-        m = matches[0]
-        props = (m.get("fields") or {}).get("properties") or {}
-        return props if isinstance(props, dict) else {}
-
-    if on_ambiguous == "first":
-        m = matches[0]
-        props = (m.get("fields") or {}).get("properties") or {}
-        return props if isinstance(props, dict) else {}
+    if len(matches) == 1 or on_ambiguous == "first":
+        return _extract_props(matches[0])
 
     if on_ambiguous == "all":
-        out: List[Tuple[str, Dict]] = []
-        for m in matches:
-            pid = m.get("id", "")
-            props = (m.get("fields") or {}).get("properties") or {}
-            out.append((pid, props if isinstance(props, dict) else {}))
-        return out
+        return [(m.get("id", ""), _extract_props(m)) for m in matches]
 
     titles = [m.get("title", "") for m in matches]
     raise RuntimeError(f"Multiple cards matched title '{name}': {titles}")
@@ -297,16 +479,25 @@ def demo():
     _check_pat()
     print(f"Base URL: {BASE_URL}")
 
-    # 1) clientConfig (also validates our CSRF header approach)
-    cfg = get_client_config()
-    _print_json(cfg, "clientConfig", max_chars=1200)
-
     # pick or discover a board
     board_id = DEFAULT_BOARD_ID
     team_id = None
 
+    # clientConfig and the teams listing have no data dependency, so dispatch
+    # them together over the pooled session; the calls are I/O-bound and the
+    # small worker count stays under Mattermost's rate limits.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        cfg_future = pool.submit(get_client_config)
+        teams_future = pool.submit(list_boards_teams) if not board_id else None
+
+        # 1) clientConfig (also validates our CSRF header approach)
+        cfg = cfg_future.result()
+        _print_json(cfg, "clientConfig", max_chars=1200)
+
+        if teams_future is not None:
+            teams = teams_future.result()
+
     if not board_id:
-        teams = list_boards_teams()
         _print_json(teams, "Boards teams/workspaces")
         if not teams:
             print("No Boards teams/workspaces found; create one in the UI first.")
@@ -335,27 +526,25 @@ def demo():
     created_id = created.get("id")
     print(f"Created card id: {created_id}")
 
+    # one fetch after the create; every lookup below runs on this list
+    query = CardQuery(list_card_blocks(board_id))
+
     # 6a) extract properties by ID
-    props_by_id = get_card_properties(board_id, created_id)
+    created_card = query.by_id(created_id)
+    props_by_id = _extract_props(created_card) if created_card else {}
     _print_json(props_by_id, "Properties of created card (by id)")
 
-    # 6b) build {card_id: properties} for all cards
-    all_props = cards_properties_map(board_id)
-    # print just a preview
-    preview_map = {k: all_props[k] for k in list(all_props.keys())[:5]}
+    # 6b) preview {card_id: properties} — only pull the first 5, lazily
+    preview_map = dict(itertools.islice(iter_cards_properties(board_id), 5))
     _print_json(preview_map, "Properties map preview (first 5)")
 
     # 6c) find by title (exact)
-    props_by_title_exact = get_card_properties_by_title(board_id, unique_title, exact=True)
+    exact_hits = query.by_title_exact(unique_title)
+    props_by_title_exact = _extract_props(exact_hits[0]) if exact_hits else {}
     _print_json(props_by_title_exact, "Properties (found by exact title)")
 
     # 6d) find by title (substring)
-    hits = get_card_properties_by_title(
-        board_id,
-        "test card",
-        exact=False,
-        on_ambiguous="all",
-    )
+    hits = [(c.get("id", ""), _extract_props(c)) for c in query.by_title_contains("test card")]
     # hits is a list[(card_id, properties)] — show only the first few
     _print_json(hits[:5], "Substring title search results (first 5)")
 
@@ -1,5 +1,9 @@
-import json
+import functools
 from mattermostdriver import Driver
+import mattermostdriver.client
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 import pprint
 import time
 
@@ -8,18 +12,15 @@ DAY = 86400
 WEEK = 604800
 AGE_THRESHOLD_SECONDS = DAY
 
-file_path = "config.json"
-config_data = {}
+from _config import load_config
+from _fastjson import loads as _json_loads
+
 try:
-    with open(file_path, "r") as f:
-        config_data = json.load(f)
-    print("Configuration data loaded successfully")
-except FileNotFoundError:
-    print(f"Error: The file '{file_path}' was not found.")
-except json.JSONDecodeError:
-    print(f"Error: Could not decode JSON from '{file_path}'. Check file format.")
-except Exception as e:
-    print(f"An unexpected error occurred: {e}")
+    import numpy as np  # optional: vectorizes the per-post age filter
+except ImportError:
+    np = None
+
+config_data = load_config()
 
 login_dict = {
     "url": config_data["hostname"],
@@ -29,9 +30,58 @@ login_dict = {
     "basepath": config_data["basepath"],
 }
 
+# The driver keeps no requests.Session of its own (it issues every call
+# through module-level requests.get/post/...), so pooling has to live on a
+# session we own. Concurrent DELETEs reuse this session's keep-alive sockets
+# instead of opening a fresh connection per request.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+# Swap the requests module the driver calls for the pooled session: a Session
+# exposes the same get/post/put/delete surface, so every driver call now
+# shares the keep-alive pool and runs this session's response hooks.
+mattermostdriver.client.requests = SESSION
+
 mattermost_api = Driver(login_dict)
 mattermost_api.login()
 
+DELETE_WORKERS = 8
+
+
+def _fast_json_hook(response, *args, **kwargs):
+    """Pre-parse JSON bodies with orjson so the driver's .json() calls reuse it.
+
+    The driver parses every response with stdlib json; on 200-post pages that
+    parse dominates the CPU side of the delete loop.
+    """
+    if "application/json" not in response.headers.get("Content-Type", ""):
+        return
+    try:
+        parsed = _json_loads(response.content)
+    except ValueError:
+        return
+    response.json = lambda **kw: parsed
+
+
+SESSION.hooks["response"].append(_fast_json_hook)
+
+_api_base = f"{login_dict['scheme']}://{login_dict['url']}:{login_dict['port']}{login_dict['basepath']}"
+_auth_headers = {"Authorization": f"Bearer {login_dict['token']}"}
+
+
+def _delete_post_raw(post_id):
+    """
+    DELETE a post straight on the pooled session, skipping the driver's
+    per-call URL assembly and option validation — the driver overhead is
+    noticeable when thousands of deletes run in a tight loop.
+    """
+    response = SESSION.delete(f"{_api_base}/posts/{post_id}", headers=_auth_headers, timeout=10)
+    response.raise_for_status()
+    return response
+
+
 testuser_data = {
     "email": "",
     "username": "",
@@ -46,6 +96,7 @@ def create_user(user_data=testuser_data):
     return mattermost_api.users.create_user(options=user_data)
 
 
+@functools.lru_cache(maxsize=128)
 def get_user_id_by_name(user_name):
     user_data = mattermost_api.users.get_user_by_username(user_name)
     if not user_data:
@@ -54,6 +105,12 @@ def get_user_id_by_name(user_name):
     return user_data["id"]
 
 
+@functools.lru_cache(maxsize=128)
+def _get_team_by_display_name(display_name):
+    teams = mattermost_api.teams.get_teams()
+    return next((team for team in teams if team["display_name"] == display_name), None)
+
+
 def print_user(user_id):
     user_data = mattermost_api.users.get_user(user_id)
     if not user_data:
@@ -88,17 +145,24 @@ def cleanup_user(user_id, first_name, last_name):
     return mattermost_api.users.update_user(user_id, options=user_data)
 
 
-hoover_channel = {
-    "team_id": next(
-        (team for team in mattermost_api.teams.get_teams() if team["display_name"] == "Palo Alto ESV"),
-        None,
-    )["id"],
-    "name": "hoover-newsfeed",
-    "display_name": "Hoover Newsfeed",
-    "type": "O",
-    "purpose": "This channel provides newsfeeds from a variety of public sources.",
-    "header": "Hoover Newsfeed",
-}
+def build_hoover_channel():
+    """Build the hoover-newsfeed channel options, resolving the team on demand.
+
+    Deferred to a function so importing this module doesn't fire a network
+    call (or crash) for a channel most callers never touch.
+    """
+    team = _get_team_by_display_name("Palo Alto ESV")
+    if team is None:
+        print("Palo Alto ESV team not found.")
+        return None
+    return {
+        "team_id": team["id"],
+        "name": "hoover-newsfeed",
+        "display_name": "Hoover Newsfeed",
+        "type": "O",
+        "purpose": "This channel provides newsfeeds from a variety of public sources.",
+        "header": "Hoover Newsfeed",
+    }
 
 
 def do_the_team_thing():
@@ -119,24 +183,33 @@ def do_the_team_thing():
         print(f"Channels found for user w6ei in Palo Alto ESV team: {len(channel_dict)}")
         for channel in channel_dict:
             print(f'Channel: {channel["display_name"]} ({channel["name"]}) - ID: {channel["id"]}')
-    print(mattermost_api.channels.create_channel(options=hoover_channel))
+    print(mattermost_api.channels.create_channel(options=build_hoover_channel()))
+
+
+def _filter_stale_ids(order, posts, cutoff_ms):
+    """Return the ids of posts at or past the cutoff, preserving page order.
+
+    With NumPy installed the update_at compare runs as one vectorized op over
+    the whole page instead of a Python-level loop per post.
+    """
+    if np is None:
+        return [pid for pid in order if posts[pid]["update_at"] <= cutoff_ms]
+    upd = np.fromiter((posts[pid]["update_at"] for pid in order), dtype=np.int64, count=len(order))
+    return np.array(order)[upd <= cutoff_ms].tolist()
 
 
 def delete_messages_in_channel(
     user_name, channel_name, team_name, age_threshold_seconds=AGE_THRESHOLD_SECONDS
 ):
-    user = mattermost_api.users.get_user_by_username(user_name)
-    if not user:
-        print(f"User {user_name} not found.")
+    user_id = get_user_id_by_name(user_name)
+    if not user_id:
         return
-    user_id = user["id"]
-    teams = mattermost_api.teams.get_teams()
-    team = next((team for team in teams if team["display_name"] == team_name), None)
+    team = _get_team_by_display_name(team_name)
     if team is None:
         print(f"Team {team_name} not found.")
         return
     team_id = team["id"]
-    channels = mattermost_api.channels.get_channels_for_user(get_user_id_by_name(user_name), team_id)
+    channels = mattermost_api.channels.get_channels_for_user(user_id, team_id)
     if not channels:
         print(f"No channels found for team {team_name} and user {user_name}.")
         return
@@ -151,33 +224,46 @@ def delete_messages_in_channel(
     print(
         f"Erasing messages in channel {channel_name} (ID: {channel_id}) in team {team_name} (ID: {team_id})"
     )
-    now_timestamp = int(time.time())
-
-    page_number = 0
-
-    while True:
-        posts = mattermost_api.posts.get_posts_for_channel(
-            channel_id, params={"page": page_number, "per_page": 200}
-        )["posts"]
-        if not posts:
-            print(f"No more messages found in channel {channel_name}.")
-            return
-        page_number += 1
-        for post_id, post_dict in posts.items():
-            update_at_timestamp = int(post_dict["update_at"] / 1000)
-            age_seconds = now_timestamp - update_at_timestamp
-
-            if age_seconds > age_threshold_seconds:
+    # Work in milliseconds end to end so the per-post check is a single
+    # integer compare instead of a divide per post.
+    cutoff_ms = int(time.time() * 1000) - age_threshold_seconds * 1000
+
+    # Page with before=<oldest seen post id> (cheaper than deep page offsets,
+    # and unaffected by deletions shifting page boundaries) and fan the
+    # DELETEs out over the pooled session.
+    before_id = ""
+    past_cutoff = False  # once a page's newest post is stale, every older page is too
+    with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as pool:
+        while True:
+            page = mattermost_api.posts.get_posts_for_channel(
+                channel_id, params={"per_page": 200, "before": before_id}
+            )
+            order = page.get("order", [])
+            if not order:
+                print(f"No more messages found in channel {channel_name}.")
+                return
+            posts = page["posts"]
+            before_id = order[-1]  # oldest post on this page (newest-first order)
+            if past_cutoff or posts[order[0]]["update_at"] <= cutoff_ms:
+                # The newest post here is already past the cutoff, so the whole
+                # page (and everything older) is stale — no per-post checks.
+                past_cutoff = True
+                stale_ids = order
+            elif posts[before_id]["update_at"] > cutoff_ms:
+                stale_ids = []  # whole page is fresh; skip the per-post scan
+            else:
+                stale_ids = _filter_stale_ids(order, posts, cutoff_ms)
+            if stale_ids:
                 print(
-                    f"Deleting post {post_id} in channel {channel_name} because age in seconds ({age_seconds}) exceeds the threshold ({age_threshold_seconds})."
+                    f"Deleting {len(stale_ids)} posts older than {age_threshold_seconds}s in channel {channel_name}."
                 )
-                mattermost_api.posts.delete_post(post_id)
-        time.sleep(5)
+            futures = [pool.submit(_delete_post_raw, pid) for pid in stale_ids]
+            for future in futures:
+                future.result()
 
 
 def lookup_channel_by_name(channel_name, team_name, user_name):
-    teams = mattermost_api.teams.get_teams()
-    team = next((team for team in teams if team["display_name"] == team_name), None)
+    team = _get_team_by_display_name(team_name)
     if team is None:
         print(f"Team {team_name} not found.")
         return
@@ -7,8 +7,10 @@ from pubsub import pub  # https://pypubsub.readthedocs.io/en/v4.0.3/
 import logging
 import os
 import argparse
-import json
-import time
+import signal
+import threading
+
+from _config import load_config
 
 DEFAULT_CFG = "/etc/meshtastic-client/config.json"
 
@@ -67,9 +69,12 @@ class MeshtasticClient:
         self.logger = logger
         self.interface = None
         # Establish a connection to the Meshtastic device
+        self._name_index = {}
         try:
             self.interface = tcp.TCPInterface(hostname=self.host, portNumber=4403, connectNow=True)
             pub.subscribe(self._on_receive, "meshtastic.receive")
+            pub.subscribe(self._on_node_updated, "meshtastic.node.updated")
+            self._rebuild_name_index()
             self.logger.info("[Meshtastic] Connected to Meshtastic device and listening for messages")
         except Exception as e:
             self.logger.error(f"[Meshtastic] Error connecting to device: {e}")
@@ -78,17 +83,25 @@ class MeshtasticClient:
     def close(self):
         self.interface.close()
 
-    # Translates a node ID into its short name and long name
-    def _id_to_name(self, interface, id):
-        short_name = ""
-        long_name = ""
-        for node_id, node_info in interface.nodes.items():
-            if id == node_id:
-                user = node_info["user"]
-                long_name = user["longName"]
-                short_name = user["shortName"]
-                break
-        return short_name, long_name
+    # Builds the node ID -> (short name, long name) map from the interface's
+    # nodedb. Built once at connect and refreshed on nodedb-change events, so
+    # per-packet lookups are a dict access instead of a scan over every node.
+    def _rebuild_name_index(self):
+        self._name_index = {
+            node_id: (node_info["user"]["shortName"], node_info["user"]["longName"])
+            for node_id, node_info in self.interface.nodes.items()
+            if "user" in node_info
+        }
+
+    def _on_node_updated(self, node=None, interface=None):
+        self._rebuild_name_index()
+
+    # Translates a node ID into its short name and long name. Reads the index
+    # built from the already-connected interface; never opens a new
+    # TCPInterface (a fresh connect costs seconds for the protobuf handshake
+    # and nodedb sync).
+    def _id_to_name(self, id):
+        return self._name_index.get(id, ("", ""))
 
     def _on_receive(self, packet, interface):
         # Check if the packet contains a text message
@@ -102,7 +115,7 @@ class MeshtasticClient:
                 text_message = packet["decoded"]["payload"].decode("utf-8")
                 # from_node = packet["from"]
                 from_id = packet["fromId"]  # from_id is of the form !da574b90
-                short_name, long_name = self._id_to_name(interface, from_id)
+                short_name, long_name = self._id_to_name(from_id)
                 callsign = long_name.split()[0].upper()
                 self.logger.debug(f"Received message <{text_message}> from {callsign}")
                 self.callback(callsign, text_message)
@@ -237,11 +250,8 @@ def main():
     )
     args = ap.parse_args()
     config_path = find_config_path(args.config)
-    try:
-        with open(config_path, "r", encoding="utf-8") as config_file:
-            config = json.load(config_file)
-    except Exception as e:
-        print(f"Error loading config {config_path}: {e}")
+    config = load_config(config_path)
+    if not config:
         return
     logger = build_logger(config.get("log_level", "DEBUG"))
     logger.debug("Logging is active")
@@ -249,6 +259,12 @@ def main():
     meshtastic_client = None
     mattermost_client = None
 
+    # Block on an Event instead of a 1 Hz sleep loop: the process is genuinely
+    # idle between packets and shuts down the instant a signal arrives.
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *args: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+
     try:
         meshtastic_config = config.get("meshtastic", {})
         mattermost_config = config.get("mattermost", {})
@@ -256,8 +272,8 @@ def main():
         meshtastic_client = MeshtasticClient(
             meshtastic_config.get("host", ""), mattermost_client.callback, logger
         )
-        while True:
-            time.sleep(1)
+        stop_event.wait()
+        logger.info("\nExiting.")
     except KeyboardInterrupt:
         logger.info("\nExiting.")
     finally: